@@ -3,21 +3,60 @@ from src.data_fetch import get_team_stats, get_team_history, get_team_roster
 from src.ai_engine import generate_advanced_comparison
 from src.web_insights import get_web_insights
 from src.social_insights import get_social_sentiment
+from src.prediction import derive_ratings, simulate_matchup, describe_prediction
+from src.matchup_matrix import MatchupMatrix
+from src.charts import (all_stats, default_stats, stat_labels, team_colors, get_chart_specs, warm_chart_cache,
+                        TEAM1_DEFAULT_COLOR, TEAM2_DEFAULT_COLOR)
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import altair as alt
+import json
 import pandas as pd
-import plotly.graph_objects as go
 import numpy as np
 import re
+import threading
 
 st.set_page_config(page_title="Hoops Hustler: NBA Team Showdown", page_icon="🏀", layout="wide")
 
-# Helper function to convert hex to rgba
-def hex_to_rgba(hex_color, opacity=0.5):
-    hex_color = hex_color.lstrip('#')
-    if len(hex_color) == 6:
-        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-        return f'rgba({r},{g},{b},{opacity})'
-    return hex_color
+# Precomputed all-pairs matchup matrix, shared across sessions; charts for its top matchups are pre-rendered
+# in the background so warmup never blocks a request
+@st.cache_resource
+def load_matchup_matrix():
+    matrix = MatchupMatrix.load() or MatchupMatrix.build({})
+    threading.Thread(target=warm_chart_cache, args=(matrix,), daemon=True).start()
+    return matrix
+
+# Background workers for the slow comparison sections. They only return data and never wait on each other;
+# the main thread chains dependent work and does all rendering.
+COMPARISON_WORKERS = 8
+
+def project_matchup(matrix, team1, team2, stats1, stats2, history1, history2):
+    # Read the projection from the matrix, simulating only when either team's ratings have moved; moved ratings
+    # are handed back so the matrix can be refreshed in the background
+    ratings = {team1: derive_ratings(stats1, history1), team2: derive_ratings(stats2, history2)}
+    prediction = matrix.prediction(team1, team2, ratings[team1], ratings[team2])
+    if prediction is not None:
+        return prediction, describe_prediction(team1, team2, prediction), {}
+    prediction = simulate_matchup(ratings[team1], ratings[team2])
+    return prediction, describe_prediction(team1, team2, prediction), ratings
+
+def analyze_matchup(team1, team2, stats1, stats2, roster1, roster2, prediction):
+    players1_names = ", ".join([player.get("PLAYER", "N/A") for player in roster1 or []])
+    players2_names = ", ".join([player.get("PLAYER", "N/A") for player in roster2 or []])
+    return generate_advanced_comparison(team1, team2, stats1, stats2, players1_names, players2_names, prediction)
+
+def save_matrix_teams(matrix, team_names):
+    for team_name in team_names:
+        matrix.save_team(team_name)
+
+def refresh_matrix_ratings(matrix, team_stats, team_ratings):
+    for team_name, ratings in team_ratings.items():
+        if matrix.update_team(team_name, team_stats[team_name], ratings):
+            matrix.save_team(team_name)
+
+def report_matrix_errors(future):
+    # Matrix writes run in the background with nobody waiting on them, so surface failures here
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Error saving matchup matrix: {future.exception()}")
 
 # Main header with custom styling
 st.markdown("""
@@ -44,63 +83,6 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Stat definitions
-all_stats = ['wins', 'losses', 'ppg', 'fg_pct', 'fg3_pct', 'ft_pct', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
-stat_labels = {
-    'wins': 'Wins', 
-    'losses': 'Losses', 
-    'ppg': 'Points Per Game', 
-    'fg_pct': 'FG%', 
-    'fg3_pct': '3PT%', 
-    'ft_pct': 'FT%', 
-    'rebounds': 'Rebounds', 
-    'assists': 'Assists', 
-    'steals': 'Steals', 
-    'blocks': 'Blocks', 
-    'turnovers': 'Turnovers'
-}
-
-# Define stat categories for better presentation
-stat_categories = {
-    'Record': ['wins', 'losses'],
-    'Shooting': ['fg_pct', 'fg3_pct', 'ft_pct'],
-    'Performance': ['ppg', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
-}
-
-# NBA team colors dictionary for better visualizations
-team_colors = {
-    'Atlanta Hawks': '#E03A3E',
-    'Boston Celtics': '#007A33',
-    'Brooklyn Nets': '#000000',
-    'Charlotte Hornets': '#1D1160',
-    'Chicago Bulls': '#CE1141',
-    'Cleveland Cavaliers': '#860038',
-    'Dallas Mavericks': '#00538C',
-    'Denver Nuggets': '#0E2240',
-    'Detroit Pistons': '#C8102E',
-    'Golden State Warriors': '#1D428A',
-    'Houston Rockets': '#CE1141',
-    'Indiana Pacers': '#002D62',
-    'LA Clippers': '#c8102E',
-    'Los Angeles Lakers': '#552583',
-    'Memphis Grizzlies': '#5D76A9',
-    'Miami Heat': '#98002E',
-    'Milwaukee Bucks': '#00471B',
-    'Minnesota Timberwolves': '#0C2340',
-    'New Orleans Pelicans': '#0C2340',
-    'New York Knicks': '#F58426',
-    'Oklahoma City Thunder': '#007AC1',
-    'Orlando Magic': '#0077C0',
-    'Philadelphia 76ers': '#006BB6',
-    'Phoenix Suns': '#1D1160',
-    'Portland Trail Blazers': '#E03A3E',
-    'Sacramento Kings': '#5A2D81',
-    'San Antonio Spurs': '#C4CED4',
-    'Toronto Raptors': '#CE1141',
-    'Utah Jazz': '#002B5C',
-    'Washington Wizards': '#002B5C'
-}
-
 # Team selection in the main area using columns
 from nba_api.stats.static import teams
 team_list = [team['full_name'] for team in teams.get_teams()]
@@ -122,7 +104,7 @@ with selection_container:
             next((team['id'] for team in teams.get_teams() if team['full_name'] == team1), "")
         )
         # Display team color as background
-        team1_color = team_colors.get(team1, '#C9082A')  # Default to red if not found
+        team1_color = team_colors.get(team1, TEAM1_DEFAULT_COLOR)
         st.markdown(f"""
         <div style="background-color: {team1_color}; padding: 10px; border-radius: 10px; text-align: center;">
             <img src="{team1_img}" width="120" style="background-color: white; border-radius: 5px; padding: 5px;">
@@ -141,7 +123,7 @@ with selection_container:
             next((team['id'] for team in teams.get_teams() if team['full_name'] == team2), "")
         )
         # Display team color as background
-        team2_color = team_colors.get(team2, '#17408B')  # Default to blue if not found
+        team2_color = team_colors.get(team2, TEAM2_DEFAULT_COLOR)
         st.markdown(f"""
         <div style="background-color: {team2_color}; padding: 10px; border-radius: 10px; text-align: center;">
             <img src="{team2_img}" width="120" style="background-color: white; border-radius: 5px; padding: 5px;">
@@ -153,7 +135,7 @@ st.markdown("### Select Stats to Compare")
 stats_to_show = st.multiselect(
     "Choose stats", 
     options=all_stats, 
-    default=['wins', 'losses', 'ppg', 'rebounds', 'assists', 'fg_pct', 'fg3_pct'],
+    default=default_stats,
     format_func=lambda x: stat_labels[x]
 )
 
@@ -163,223 +145,199 @@ if st.button("Compare Teams", type="primary", use_container_width=True):
     if team1 == team2:
         st.warning("⚠️ Please select two different teams for comparison!")
     else:
-        with st.spinner(f"Fetching stats for {team1} and {team2}..."):
-            stats1 = get_team_stats(team1)
-            stats2 = get_team_stats(team2)
-            history1 = get_team_history(team1)
-            history2 = get_team_history(team2)
-            roster1 = get_team_roster(team1)
-            roster2 = get_team_roster(team2)
-        
-        if not stats1 or not stats2:
-            st.error("❌ Couldn't fetch stats. Check team validity or try again later.")
-        else:
-            # Get team colors for visualizations
-            team1_color = team_colors.get(team1, '#C9082A')  # Default to red if not found
-            team2_color = team_colors.get(team2, '#17408B')  # Default to blue if not found
-            
-            # Create two columns for team logos and stats
-            team_cols = st.columns(2)
-            with team_cols[0]:
-                st.markdown(f"""
-                <div style="background-color: {team1_color}; padding: 10px; border-radius: 10px; text-align: center;">
-                    <img src="{team1_img}" width="80" style="background-color: white; border-radius: 5px; padding: 5px;">
-                    <h3 style="color: white; margin-top: 5px;">{team1}</h3>
-                </div>
-                """, unsafe_allow_html=True)
-            with team_cols[1]:
-                st.markdown(f"""
-                <div style="background-color: {team2_color}; padding: 10px; border-radius: 10px; text-align: center;">
-                    <img src="{team2_img}" width="80" style="background-color: white; border-radius: 5px; padding: 5px;">
-                    <h3 style="color: white; margin-top: 5px;">{team2}</h3>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Display team stats in a nice table
-            st.markdown("## Team Statistics")
-            df_stats = pd.DataFrame({
-                stat_labels[stat]: [stats1.get(stat, "N/A"), stats2.get(stat, "N/A")]
-                for stat in stats_to_show
-            }, index=[team1, team2])
-            st.dataframe(df_stats.style.format(precision=2), use_container_width=True)
-            
-            # 🧠 Advanced AI Analysis section - moved to the top for prominence
-            st.markdown("## 🧠 Advanced AI Analysis")
-            with st.spinner("Generating advanced analysis..."):
-                players1_names = ", ".join([player.get("PLAYER", "N/A") for player in roster1])
-                players2_names = ", ".join([player.get("PLAYER", "N/A") for player in roster2])
-                advanced_comparison = generate_advanced_comparison(team1, team2, stats1, stats2, players1_names, players2_names)
-            
-            st.markdown(advanced_comparison)
-            
-            # Interactive Visualizations section
-            st.markdown("## Interactive Visualizations")
-            
-            # Tabs for visualisations
-            viz_tabs = st.tabs(["Radar Chart", "Bar Chart", "Head-to-Head", "Historical Trends"])
-            
-            # Prepare data for visualisations
-            viz_data = pd.DataFrame()
-            for stat in stats_to_show:
-                if stat in stats1 and stat in stats2:
-                    new_row = pd.DataFrame({
-                        'Statistic': [stat_labels[stat], stat_labels[stat]],
-                        'Value': [stats1[stat], stats2[stat]],
-                        'Team': [team1, team2]
-                    })
-                    viz_data = pd.concat([viz_data, new_row], ignore_index=True)
-            
-            # Radar Chart Tab (now first for better visual impact)
-            with viz_tabs[0]:
-                radar_stats = [s for s in stats_to_show if s not in ['wins', 'losses']]
-                if len(radar_stats) >= 3:
-                    radar_data = {}
-                    for stat in radar_stats:
-                        if stat in stats1 and stat in stats2:
-                            max_val = max(stats1[stat], stats2[stat])
-                            if stat == 'turnovers':
-                                radar_data[stat] = {
-                                    team1: 1 - (stats1[stat] / max_val) if max_val > 0 else 0,
-                                    team2: 1 - (stats2[stat] / max_val) if max_val > 0 else 0
-                                }
-                            else:
-                                radar_data[stat] = {
-                                    team1: stats1[stat] / max_val if max_val > 0 else 0,
-                                    team2: stats2[stat] / max_val if max_val > 0 else 0
-                                }
-                    
-                    # Convert hex colors to rgba for transparency
-                    team1_fill = hex_to_rgba(team1_color, 0.3)
-                    team2_fill = hex_to_rgba(team2_color, 0.3)
-                    
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatterpolar(
-                        r=[radar_data[stat][team1] for stat in radar_stats],
-                        theta=[stat_labels[stat] for stat in radar_stats],
-                        fill='toself',
-                        name=team1,
-                        line=dict(color=team1_color),
-                        fillcolor=team1_fill
-                    ))
-                    fig.add_trace(go.Scatterpolar(
-                        r=[radar_data[stat][team2] for stat in radar_stats],
-                        theta=[stat_labels[stat] for stat in radar_stats],
-                        fill='toself',
-                        name=team2,
-                        line=dict(color=team2_color),
-                        fillcolor=team2_fill
-                    ))
-                    fig.update_layout(
-                        polar=dict(
-                            radialaxis=dict(
-                                visible=True,
-                                range=[0, 1]
-                            )
-                        ),
-                        showlegend=True,
-                        height=500,
-                        margin=dict(l=80, r=80, t=20, b=20),
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)'
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("Select at least 3 non-win/loss stats for a radar chart.")
+        # Start every fetch at once; stats gate the page, everything else fills in as it arrives
+        with ThreadPoolExecutor(max_workers=COMPARISON_WORKERS) as executor:
+            stats_futures = [executor.submit(get_team_stats, team) for team in (team1, team2)]
+            pending = {
+                executor.submit(get_team_history, team1): 'history1',
+                executor.submit(get_team_history, team2): 'history2',
+                executor.submit(get_team_roster, team1): 'roster1',
+                executor.submit(get_team_roster, team2): 'roster2',
+                executor.submit(get_social_sentiment, team1, team2): 'sentiment',
+                executor.submit(get_web_insights, team1, team2): 'news'
+            }
+
+            with st.spinner(f"Fetching stats for {team1} and {team2}..."):
+                stats1, stats2 = (future.result() for future in stats_futures)
             
-            # Bar Chart Tab with categorized stats
-            with viz_tabs[1]:
-                # Record Comparison (Wins and Losses)
-                if any(s in stats_to_show for s in stat_categories['Record']):
-                    st.subheader("Record Comparison")
-                    record_stats = [s for s in stats_to_show if s in stat_categories['Record']]
-                    record_data = viz_data[viz_data['Statistic'].isin([stat_labels[s] for s in record_stats])]
-                    chart = alt.Chart(record_data).mark_bar().encode(
-                        y=alt.Y('Statistic:N', title=None),
-                        x=alt.X('Value:Q', title='Count'),
-                        color=alt.Color('Team:N', scale=alt.Scale(domain=[team1, team2], range=[team1_color, team2_color])),
-                        tooltip=['Team', 'Statistic', 'Value']
-                    ).properties(height=len(record_stats)*50)
-                    st.altair_chart(chart, use_container_width=True)
+            if not stats1 or not stats2:
+                executor.shutdown(wait=False, cancel_futures=True)
+                st.error("❌ Couldn't fetch stats. Check team validity or try again later.")
+            else:
+                # Get team colors for visualizations
+                team1_color = team_colors.get(team1, TEAM1_DEFAULT_COLOR)
+                team2_color = team_colors.get(team2, TEAM2_DEFAULT_COLOR)
                 
-                # Shooting Comparison (FG%, 3PT%, FT%)
-                if any(s in stats_to_show for s in stat_categories['Shooting']):
-                    st.subheader("Shooting Comparison")
-                    shooting_stats = [s for s in stats_to_show if s in stat_categories['Shooting']]
-                    shooting_data = viz_data[viz_data['Statistic'].isin([stat_labels[s] for s in shooting_stats])].copy()
-                    shooting_data['Value'] = shooting_data['Value'] * 100  # Scale to 0-100
-                    chart = alt.Chart(shooting_data).mark_bar().encode(
-                        y=alt.Y('Statistic:N', title=None),
-                        x=alt.X('Value:Q', title='Percentage (%)', scale=alt.Scale(domain=[0,100])),
-                        color=alt.Color('Team:N', scale=alt.Scale(domain=[team1, team2], range=[team1_color, team2_color])),
-                        tooltip=['Team', 'Statistic', alt.Tooltip('Value:Q', format='.2f')]
-                    ).properties(height=len(shooting_stats)*50)
-                    st.altair_chart(chart, use_container_width=True)
+                # Create two columns for team logos and stats
+                team_cols = st.columns(2)
+                with team_cols[0]:
+                    st.markdown(f"""
+                    <div style="background-color: {team1_color}; padding: 10px; border-radius: 10px; text-align: center;">
+                        <img src="{team1_img}" width="80" style="background-color: white; border-radius: 5px; padding: 5px;">
+                        <h3 style="color: white; margin-top: 5px;">{team1}</h3>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with team_cols[1]:
+                    st.markdown(f"""
+                    <div style="background-color: {team2_color}; padding: 10px; border-radius: 10px; text-align: center;">
+                        <img src="{team2_img}" width="80" style="background-color: white; border-radius: 5px; padding: 5px;">
+                        <h3 style="color: white; margin-top: 5px;">{team2}</h3>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                # Performance Comparison (PPG, Rebounds, Assists, etc.)
-                if any(s in stats_to_show for s in stat_categories['Performance']):
-                    st.subheader("Performance Comparison")
-                    performance_stats = [s for s in stats_to_show if s in stat_categories['Performance']]
-                    performance_data = viz_data[viz_data['Statistic'].isin([stat_labels[s] for s in performance_stats])]
-                    chart = alt.Chart(performance_data).mark_bar().encode(
-                        y=alt.Y('Statistic:N', title=None),
-                        x=alt.X('Value:Q', title='Value'),
-                        color=alt.Color('Team:N', scale=alt.Scale(domain=[team1, team2], range=[team1_color, team2_color])),
-                        tooltip=['Team', 'Statistic', 'Value']
-                    ).properties(height=len(performance_stats)*50)
-                    st.altair_chart(chart, use_container_width=True)
-            
-            # Head-to-Head Comparison Tab
-            with viz_tabs[2]:
-                comparison_data = []
-                for stat in stats_to_show:
-                    if stat in stats1 and stat in stats2:
-                        if stat in ['losses', 'turnovers']:
-                            better_team = team1 if stats1[stat] < stats2[stat] else team2 if stats2[stat] < stats1[stat] else "Tie"
-                        else:
-                            better_team = team1 if stats1[stat] > stats2[stat] else team2 if stats2[stat] > stats1[stat] else "Tie"
-                        comparison_data.append({
-                            'Statistic': stat_labels[stat],
-                            team1: stats1[stat],
-                            team2: stats2[stat],
-                            'Edge': better_team
-                        })
-                comparison_df = pd.DataFrame(comparison_data)
-                st.dataframe(comparison_df, use_container_width=True, height=400)
-            
-            # Historical Trends Tab
-            with viz_tabs[3]:
-                if history1 is not None and history2 is not None:
-                    st.subheader("Historical Game Logs")
-                    
-                    # Filter out Team_ID and Game_ID columns if they exist
-                    if 'Team_ID' in history1.columns:
-                        history1 = history1.drop(columns=['Team_ID'])
-                    if 'Game_ID' in history1.columns:
-                        history1 = history1.drop(columns=['Game_ID'])
-                    if 'Team_ID' in history2.columns:
-                        history2 = history2.drop(columns=['Team_ID'])
-                    if 'Game_ID' in history2.columns:
-                        history2 = history2.drop(columns=['Game_ID'])
-                    
-                    history_tabs = st.tabs([f"{team1} Recent Games", f"{team2} Recent Games"])
-                    with history_tabs[0]:
-                        st.dataframe(history1.head(10), use_container_width=True)
-                    with history_tabs[1]:
-                        st.dataframe(history2.head(10), use_container_width=True)
-                else:
-                    st.info("Historical data not available for one or both teams.")
-            
-            # Additional insights sections
-            st.markdown("## 📊 Social Insights")
-            sentiment = get_social_sentiment(team1, team2)
-            st.markdown(sentiment)
-            
-            st.markdown("## 📰 Web Insights")
-            news = get_web_insights(team1, team2)
-            st.markdown(news)
-            
-            # Bottom action buttons - Fix for experimental_rerun
-            st.button("Run Another Comparison", type="primary", use_container_width=True, key="rerun_btn", on_click=st.rerun)
+                # Display team stats in a nice table
+                st.markdown("## Team Statistics")
+                df_stats = pd.DataFrame({
+                    stat_labels[stat]: [stats1.get(stat, "N/A"), stats2.get(stat, "N/A")]
+                    for stat in stats_to_show
+                }, index=[team1, team2])
+                st.dataframe(df_stats.style.format(precision=2), use_container_width=True)
+                
+                # 🎯 Model Projection - deterministic numbers the AI analysis explains
+                st.markdown("## 🎯 Model Projection")
+                projection_placeholder = st.empty()
+                projection_placeholder.info("⏳ Simulating the matchup...")
+
+                # 🧠 Advanced AI Analysis section - moved to the top for prominence
+                st.markdown("## 🧠 Advanced AI Analysis")
+                analysis_placeholder = st.empty()
+                analysis_placeholder.info("⏳ Generating advanced analysis...")
+                
+                # Interactive Visualizations section
+                st.markdown("## Interactive Visualizations")
+                
+                # Tabs for visualisations
+                viz_tabs = st.tabs(["Radar Chart", "Bar Chart", "Head-to-Head", "Historical Trends"])
+                
+                # Pre-rendered chart specs, cached per matchup, stat selection and data version
+                chart_specs = get_chart_specs(team1, team2, stats1, stats2, stats_to_show)
+
+                # Radar Chart Tab (now first for better visual impact)
+                with viz_tabs[0]:
+                    if chart_specs['radar']:
+                        st.plotly_chart(json.loads(chart_specs['radar']), use_container_width=True)
+                    else:
+                        st.info("Select at least 3 non-win/loss stats for a radar chart.")
+                
+                # Bar Chart Tab with categorized stats
+                with viz_tabs[1]:
+                    for category, spec in chart_specs['bars'].items():
+                        st.subheader(f"{category} Comparison")
+                        st.vega_lite_chart(json.loads(spec), use_container_width=True)
+                
+                # Head-to-Head Comparison Tab - refresh both teams in memory (only their row/column is
+                # recomputed if stats changed) and persist the changes in the background
+                with viz_tabs[2]:
+                    matrix = load_matchup_matrix()
+                    changed_teams = [team for team, stats in ((team1, stats1), (team2, stats2)) if matrix.update_team(team, stats)]
+                    if changed_teams:
+                        executor.submit(save_matrix_teams, matrix, changed_teams).add_done_callback(report_matrix_errors)
+                    matchup = matrix.lookup(team1, team2)
+                    comparison_data = []
+                    for stat in stats_to_show:
+                        if matchup['edges'][stat] is not None:
+                            comparison_data.append({
+                                'Statistic': stat_labels[stat],
+                                team1: stats1[stat],
+                                team2: stats2[stat],
+                                'Edge': matchup['edges'][stat]
+                            })
+                    comparison_df = pd.DataFrame(comparison_data)
+                    st.dataframe(comparison_df, use_container_width=True, height=400)
+                
+                # Historical Trends Tab
+                with viz_tabs[3]:
+                    trends_placeholder = st.empty()
+                    trends_placeholder.info("⏳ Loading game logs...")
+                
+                # Additional insights sections
+                st.markdown("## 📊 Social Insights")
+                sentiment_placeholder = st.empty()
+                sentiment_placeholder.info("⏳ Gathering social sentiment...")
+                
+                st.markdown("## 📰 Web Insights")
+                news_placeholder = st.empty()
+                news_placeholder.info("⏳ Fetching recent news...")
+                
+                # Bottom action buttons - Fix for experimental_rerun
+                st.button("Run Another Comparison", type="primary", use_container_width=True, key="rerun_btn", on_click=st.rerun)
+
+                # Fill each slow section as its worker finishes, starting dependent work once its inputs are ready.
+                # A failing section shows its own error and hands None on to anything that depends on it.
+                section_placeholders = {
+                    'history1': trends_placeholder,
+                    'history2': trends_placeholder,
+                    'roster1': analysis_placeholder,
+                    'roster2': analysis_placeholder,
+                    'projection': projection_placeholder,
+                    'analysis': analysis_placeholder,
+                    'sentiment': sentiment_placeholder,
+                    'news': news_placeholder
+                }
+                results = {}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        section = pending.pop(future)
+                        try:
+                            results[section] = future.result()
+                        except Exception as e:
+                            results[section] = None
+                            section_placeholders[section].error(f"⚠️ Couldn't load this section: {e}")
+                            continue
+
+                        if section == 'projection':
+                            prediction, prediction_text, moved_ratings = results['projection']
+                            if moved_ratings:
+                                refresh = executor.submit(refresh_matrix_ratings, matrix, {team1: stats1, team2: stats2}, moved_ratings)
+                                refresh.add_done_callback(report_matrix_errors)
+                            with projection_placeholder.container():
+                                projection_cols = st.columns(3)
+                                projection_cols[0].metric(f"{team1} Win Probability", f"{prediction.team1_win_prob:.1%}")
+                                projection_cols[1].metric(f"{team2} Win Probability", f"{prediction.team2_win_prob:.1%}")
+                                projection_cols[2].metric("Projected Score", f"{prediction.team1_score:.0f} - {prediction.team2_score:.0f}",
+                                                          delta=f"{team1} {prediction.spread:+.1f}", delta_color="off")
+                                margin_data = pd.DataFrame({'Margin': prediction.margin_bins, 'Probability': prediction.margin_probs})
+                                margin_chart = alt.Chart(margin_data).mark_bar().encode(
+                                    x=alt.X('Margin:Q', title=f'{team1} margin (points)'),
+                                    y=alt.Y('Probability:Q', title='Share of simulations', axis=alt.Axis(format='%')),
+                                    color=alt.condition(alt.datum.Margin >= 0, alt.value(team1_color), alt.value(team2_color)),
+                                    tooltip=['Margin', alt.Tooltip('Probability:Q', format='.1%')]
+                                ).properties(height=200)
+                                st.altair_chart(margin_chart, use_container_width=True)
+                                st.caption(prediction_text)
+                        elif section == 'analysis':
+                            analysis_placeholder.markdown(results['analysis'])
+                        elif section == 'sentiment':
+                            sentiment_placeholder.markdown(results['sentiment'])
+                        elif section == 'news':
+                            news_placeholder.markdown(results['news'])
+
+                    # Game logs feed both the trends tab and the projection
+                    if 'history1' in results and 'history2' in results and 'projection' not in results and 'projection' not in pending.values():
+                        history1, history2 = results['history1'], results['history2']
+                        pending[executor.submit(project_matchup, matrix, team1, team2, stats1, stats2, history1, history2)] = 'projection'
+                        with trends_placeholder.container():
+                            if history1 is not None and history2 is not None:
+                                st.subheader("Historical Game Logs")
+                                
+                                # Filter out Team_ID and Game_ID columns if they exist
+                                history1 = history1.drop(columns=['Team_ID', 'Game_ID'], errors='ignore')
+                                history2 = history2.drop(columns=['Team_ID', 'Game_ID'], errors='ignore')
+                                
+                                history_tabs = st.tabs([f"{team1} Recent Games", f"{team2} Recent Games"])
+                                with history_tabs[0]:
+                                    st.dataframe(history1.head(10), use_container_width=True)
+                                with history_tabs[1]:
+                                    st.dataframe(history2.head(10), use_container_width=True)
+                            else:
+                                st.info("Historical data not available for one or both teams.")
+
+                    # The analysis explains the projection, so it starts once the projection and rosters are in
+                    if all(key in results for key in ('projection', 'roster1', 'roster2')) and 'analysis' not in results and 'analysis' not in pending.values():
+                        prediction = results['projection'][0] if results['projection'] else None
+                        pending[executor.submit(analyze_matchup, team1, team2, stats1, stats2,
+                                                results['roster1'], results['roster2'], prediction)] = 'analysis'
 else:
     # Welcome screen with better styling is now at the top of the app
     pass
\ No newline at end of file
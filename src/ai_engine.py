@@ -1,11 +1,15 @@
 import os
 from dotenv import load_dotenv
 from langchain.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain_community.llms import OpenAI
 from langchain_ollama import OllamaLLM  # Updated import for Ollama
 from pydantic import BaseModel
 import yaml
 from tenacity import retry, stop_after_attempt, wait_exponential
+from src.llm_router import Backend, LLMRouter
+from src.prediction import describe_prediction
+from src.semantic_cache import analysis_cache
 
 # Load environment variables
 load_dotenv()
@@ -35,28 +39,54 @@ prompt = PromptTemplate(
 
 # Advanced prompt template for deeper analysis (team and player-level)
 advanced_prompt_config = yaml.safe_load("""
-template: "You are an advanced NBA analyst. Compare teams {team1} and {team2} using team stats {stats1} vs {stats2} and player performances {players1} vs {players2}. Provide historical context, key player insights, and predictive analysis."
+template: "You are an advanced NBA analyst. Compare teams {team1} and {team2} using team stats {stats1} vs {stats2} and player performances {players1} vs {players2}. {prediction} Provide historical context, key player insights, and predictive analysis. When a model projection is given, explain the factors behind its numbers rather than inventing your own odds or scores."
 """)
 advanced_prompt = PromptTemplate(
-    input_variables=["team1", "team2", "stats1", "stats2", "players1", "players2"],
+    input_variables=["team1", "team2", "stats1", "stats2", "players1", "players2", "prediction"],
     template=advanced_prompt_config['template']
 )
 
-# Initialize LLM based on .env settings with improved models
+# Initialize LLM backends based on .env settings; requests are routed to the fastest healthy one
 use_ollama = os.getenv("USE_OLLAMA", "false").lower().strip() == "true"
-if use_ollama:
-    llm = OllamaLLM(model=os.getenv("OLLAMA_MODEL", "llama3.2"))
-else:
-    api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    if not api_key or api_key == "your_openai_api_key":
+
+def configured_backends():
+    """Build the backends listed in LLM_BACKENDS, local Ollama first by default."""
+    default_backends = "ollama,openai" if use_ollama else "openai"
+    names = [name.strip().lower() for name in os.getenv("LLM_BACKENDS", default_backends).split(",") if name.strip()]
+    backends = []
+    for name in names:
+        if name == "ollama":
+            backends.append(Backend(
+                "ollama",
+                OllamaLLM(model=os.getenv("OLLAMA_MODEL", "llama3.2")),
+                max_concurrency=int(os.getenv("OLLAMA_CONCURRENCY", "2")),
+                timeout=float(os.getenv("OLLAMA_TIMEOUT", "120")),
+                local=True
+            ))
+        elif name == "openai":
+            api_key = os.getenv("OPENAI_API_KEY", "").strip()
+            if not api_key or api_key == "your_openai_api_key":
+                continue
+            backends.append(Backend(
+                "openai",
+                OpenAI(
+                    openai_api_key=api_key,
+                    base_url=os.getenv("OPENAI_URL", "https://api.openai.com/v1"),
+                    model=os.getenv("OPENAI_MODEL", "gpt-4")
+                ),
+                max_concurrency=int(os.getenv("OPENAI_CONCURRENCY", "8")),
+                timeout=float(os.getenv("OPENAI_TIMEOUT", "60"))
+            ))
+        else:
+            raise ValueError(f"Unknown LLM backend '{name}' in LLM_BACKENDS. Use 'ollama' and/or 'openai'.")
+    if not backends:
         raise ValueError(
             "OpenAI API key is missing or invalid. Provide a valid OPENAI_API_KEY in .env or set USE_OLLAMA=true."
         )
-    llm = OpenAI(
-        openai_api_key=api_key,
-        base_url=os.getenv("OPENAI_URL", "https://api.openai.com/v1"),
-        model=os.getenv("OPENAI_MODEL", "gpt-4")
-    )
+    return backends
+
+llm_router = LLMRouter(configured_backends(), hedge_after=float(os.getenv("LLM_HEDGE_AFTER", "15")))
+llm = RunnableLambda(llm_router.invoke)
 
 # Create a Runnable sequence for basic analysis
 basic_runnable = prompt | llm
@@ -86,19 +116,34 @@ def generate_comparison(team1, team2, stats1, stats2):
     wait=wait_exponential(multiplier=1, min=2, max=10),
     reraise=True
 )
-def generate_advanced_comparison(team1, team2, stats1, stats2, players1, players2):
-    """Generate an advanced AI analysis including player-level insights."""
+def generate_advanced_comparison(team1, team2, stats1, stats2, players1, players2, prediction=None):
+    """Generate an advanced AI analysis including player-level insights.
+
+    `prediction` is an optional src.prediction.MatchupPrediction the analysis should explain.
+    """
     try:
         TeamStats(**stats1)
         TeamStats(**stats2)
+        prediction_text = describe_prediction(team1, team2, prediction) if prediction else None
+        projection = {'win_prob': prediction.team1_win_prob, 'spread': prediction.spread} if prediction else None
+        # Reuse a recent analysis of this matchup if the stats and projection have only drifted slightly since
+        cached = analysis_cache.lookup(team1, team2, stats1, stats2, players1, players2, projection)
+        if cached is not None:
+            analysis, cached_prediction_text = cached
+            if prediction_text and cached_prediction_text != prediction_text:
+                # Light refresh: the reasoning still holds, but point readers at the current numbers
+                analysis += f"\n\n_Updated since this analysis was written. {prediction_text}_"
+            return analysis
         result = advanced_runnable.invoke({
             "team1": team1,
             "team2": team2,
             "stats1": stats1,
             "stats2": stats2,
             "players1": players1,
-            "players2": players2
+            "players2": players2,
+            "prediction": prediction_text or "No model projection is available."
         })
+        analysis_cache.add(team1, team2, stats1, stats2, players1, players2, result, projection, prediction_text)
         return result
     except Exception as e:
         print(f"Error generating advanced comparison: {e}")
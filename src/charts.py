@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import altair as alt
+import pandas as pd
+import plotly.graph_objects as go
+from src.matchup_matrix import pair_radar
+
+# Stat definitions
+all_stats = ['wins', 'losses', 'ppg', 'fg_pct', 'fg3_pct', 'ft_pct', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
+default_stats = ['wins', 'losses', 'ppg', 'rebounds', 'assists', 'fg_pct', 'fg3_pct']
+stat_labels = {
+    'wins': 'Wins',
+    'losses': 'Losses',
+    'ppg': 'Points Per Game',
+    'fg_pct': 'FG%',
+    'fg3_pct': '3PT%',
+    'ft_pct': 'FT%',
+    'rebounds': 'Rebounds',
+    'assists': 'Assists',
+    'steals': 'Steals',
+    'blocks': 'Blocks',
+    'turnovers': 'Turnovers'
+}
+
+# Define stat categories for better presentation
+stat_categories = {
+    'Record': ['wins', 'losses'],
+    'Shooting': ['fg_pct', 'fg3_pct', 'ft_pct'],
+    'Performance': ['ppg', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
+}
+
+# NBA team colors dictionary for better visualizations
+team_colors = {
+    'Atlanta Hawks': '#E03A3E',
+    'Boston Celtics': '#007A33',
+    'Brooklyn Nets': '#000000',
+    'Charlotte Hornets': '#1D1160',
+    'Chicago Bulls': '#CE1141',
+    'Cleveland Cavaliers': '#860038',
+    'Dallas Mavericks': '#00538C',
+    'Denver Nuggets': '#0E2240',
+    'Detroit Pistons': '#C8102E',
+    'Golden State Warriors': '#1D428A',
+    'Houston Rockets': '#CE1141',
+    'Indiana Pacers': '#002D62',
+    'LA Clippers': '#c8102E',
+    'Los Angeles Lakers': '#552583',
+    'Memphis Grizzlies': '#5D76A9',
+    'Miami Heat': '#98002E',
+    'Milwaukee Bucks': '#00471B',
+    'Minnesota Timberwolves': '#0C2340',
+    'New Orleans Pelicans': '#0C2340',
+    'New York Knicks': '#F58426',
+    'Oklahoma City Thunder': '#007AC1',
+    'Orlando Magic': '#0077C0',
+    'Philadelphia 76ers': '#006BB6',
+    'Phoenix Suns': '#1D1160',
+    'Portland Trail Blazers': '#E03A3E',
+    'Sacramento Kings': '#5A2D81',
+    'San Antonio Spurs': '#C4CED4',
+    'Toronto Raptors': '#CE1141',
+    'Utah Jazz': '#002B5C',
+    'Washington Wizards': '#002B5C'
+}
+TEAM1_DEFAULT_COLOR = '#C9082A'  # Red
+TEAM2_DEFAULT_COLOR = '#17408B'  # Blue
+
+# Bar chart settings per stat category: (x-axis title, value scale, x domain, tooltip format)
+bar_chart_settings = {
+    'Record': ('Count', 1, None, None),
+    'Shooting': ('Percentage (%)', 100, [0, 100], '.2f'),
+    'Performance': ('Value', 1, None, None)
+}
+
+# Serialized chart specs, keyed by matchup, selected stats and data version
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "256"))
+
+class ChartSpecCache:
+    """Thread-safe LRU cache of serialized chart specs."""
+
+    def __init__(self, maxsize=CHART_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+chart_cache = ChartSpecCache()
+
+# Helper function to convert hex to rgba
+def hex_to_rgba(hex_color, opacity=0.5):
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 6:
+        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+        return f'rgba({r},{g},{b},{opacity})'
+    return hex_color
+
+def data_version(stats1, stats2):
+    """Short content hash of both teams' stats, used to invalidate cached specs when stats move."""
+    payload = json.dumps([[_normalize(stats.get(stat)) for stat in all_stats] for stats in (stats1, stats2)])
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+def _normalize(value):
+    # Cached, fresh and matrix stats differ in numeric types and missing-value markers
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 6)
+
+def render_radar_spec(team1, team2, stats1, stats2, selected_stats):
+    """Build the radar chart as Plotly JSON, or None if fewer than 3 non-record stats are selected."""
+    radar_stats = [s for s in selected_stats if s not in stat_categories['Record']]
+    if len(radar_stats) < 3:
+        return None
+    radar = pair_radar(stats1, stats2)
+    team1_color = team_colors.get(team1, TEAM1_DEFAULT_COLOR)
+    team2_color = team_colors.get(team2, TEAM2_DEFAULT_COLOR)
+
+    fig = go.Figure()
+    for i, (team, color) in enumerate([(team1, team1_color), (team2, team2_color)]):
+        fig.add_trace(go.Scatterpolar(
+            r=[radar[stat][i] or 0 for stat in radar_stats],
+            theta=[stat_labels[stat] for stat in radar_stats],
+            fill='toself',
+            name=team,
+            line=dict(color=color),
+            fillcolor=hex_to_rgba(color, 0.3)
+        ))
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )
+        ),
+        showlegend=True,
+        height=500,
+        margin=dict(l=80, r=80, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig.to_json()
+
+def render_bar_specs(team1, team2, stats1, stats2, selected_stats):
+    """Build one Vega-Lite bar chart spec per stat category that has selected stats."""
+    team1_color = team_colors.get(team1, TEAM1_DEFAULT_COLOR)
+    team2_color = team_colors.get(team2, TEAM2_DEFAULT_COLOR)
+    specs = {}
+    for category, (title, scale, domain, value_format) in bar_chart_settings.items():
+        category_stats = [s for s in selected_stats if s in stat_categories[category]]
+        if not category_stats:
+            continue
+        rows = [
+            {'Statistic': stat_labels[stat], 'Value': stats[stat] * scale, 'Team': team}
+            for stat in category_stats
+            for team, stats in ((team1, stats1), (team2, stats2))
+            if stats.get(stat) is not None
+        ]
+        chart = alt.Chart(pd.DataFrame(rows, columns=['Statistic', 'Value', 'Team'])).mark_bar().encode(
+            y=alt.Y('Statistic:N', title=None),
+            x=alt.X('Value:Q', title=title, scale=alt.Scale(domain=domain) if domain else alt.Undefined),
+            color=alt.Color('Team:N', scale=alt.Scale(domain=[team1, team2], range=[team1_color, team2_color])),
+            tooltip=['Team', 'Statistic', alt.Tooltip('Value:Q', format=value_format) if value_format else 'Value']
+        ).properties(height=len(category_stats)*50)
+        specs[category] = chart.to_json()
+    return specs
+
+def get_chart_specs(team1, team2, stats1, stats2, selected_stats, version=None):
+    """Return {'radar': ..., 'bars': {...}} serialized specs for a matchup, rendering only on a cache miss."""
+    version = version or data_version(stats1, stats2)
+    key = (team1, team2, tuple(selected_stats), version)
+    specs = chart_cache.get(key)
+    if specs is None:
+        specs = {
+            'radar': render_radar_spec(team1, team2, stats1, stats2, selected_stats),
+            'bars': render_bar_specs(team1, team2, stats1, stats2, selected_stats)
+        }
+        chart_cache.put(key, specs)
+    return specs
+
+def warm_chart_cache(matrix, limit=10, selected_stats=default_stats):
+    """Pre-render chart specs for the top matchups in the matrix with the default stat selection.
+
+    Both team orders are rendered, since either team can be picked first. Returns the number of matchups warmed.
+    """
+    warmed = 0
+    for team1, team2 in matrix.top_matchups(limit):
+        stats1, stats2 = matrix.team_stats(team1), matrix.team_stats(team2)
+        get_chart_specs(team1, team2, stats1, stats2, selected_stats)
+        get_chart_specs(team2, team1, stats2, stats1, selected_stats)
+        warmed += 1
+    return warmed
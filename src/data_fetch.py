@@ -1,5 +1,6 @@
 from nba_api.stats.static import teams
 from nba_api.stats.endpoints import teamdashboardbygeneralsplits, commonteamroster, teamgamelog
+from nba_api.stats.library.parameters import Season
 import numpy as np
 import pandas as pd
 import os
@@ -9,6 +10,9 @@ from sqlalchemy import create_engine
 os.makedirs('data', exist_ok=True)
 engine = create_engine('sqlite:///data/teams.db')
 
+# Season used for both the stats dashboard and the game logs, so ratings never mix seasons
+CURRENT_SEASON = Season.default
+
 def get_team_id(team_name):
     team = [t for t in teams.get_teams() if t['full_name'].lower() == team_name.lower()]
     return team[0]['id'] if team else None
@@ -40,7 +44,9 @@ def get_team_stats(team_name):
         return None
 
     try:
-        dashboard = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(team_id=team_id)
+        dashboard = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
+            team_id=team_id, season=CURRENT_SEASON, per_mode_detailed='PerGame'
+        )
         data = dashboard.get_dict()['resultSets'][0]
         headers = data['headers']
         stats_row = data['rowSet'][0]
@@ -79,7 +85,7 @@ def get_team_roster(team_name):
         print(f"Error fetching roster for {team_name}: {e}")
         return []
 
-def get_team_history(team_name, season='2022-23'):
+def get_team_history(team_name, season=CURRENT_SEASON):
     """Fetch historical game logs for the team."""
     team_id = get_team_id(team_name)
     if not team_id:
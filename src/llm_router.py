@@ -0,0 +1,205 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+
+# Backoff for a backend after a failure or timeout, doubling per consecutive failure
+FAILURE_COOLDOWN = 5.0
+MAX_FAILURE_COOLDOWN = 120.0
+# How often the router checks whether a call queued on a busy backend has started, so its timeout can begin
+QUEUED_POLL_INTERVAL = 0.05
+
+class Attempt:
+    """One call routed to a backend. The router abandons it on timeout or when another backend answers first.
+
+    The timeout clock starts when the backend begins the call, not while it waits for a free slot. Once
+    abandoned, the attempt no longer reports to the backend's health, so a late answer can't undo a timeout.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = None
+        self.finished = False
+        self.abandoned = False
+
+    def start(self):
+        """Mark the call as running; returns False if it was abandoned while queued."""
+        with self.lock:
+            if self.abandoned:
+                return False
+            self.started = time.monotonic()
+            return True
+
+    def finish(self):
+        """Mark the call as done; returns False if the router already gave up on it."""
+        with self.lock:
+            if self.abandoned:
+                return False
+            self.finished = True
+            return True
+
+    def abandon(self):
+        """Give up on the call; returns False if it already finished."""
+        with self.lock:
+            if self.finished:
+                return False
+            self.abandoned = True
+            return True
+
+class Backend:
+    """One LLM backend (anything with an invoke method) with its own concurrency limit, timeout and latency EWMA."""
+
+    def __init__(self, name, llm, max_concurrency=4, timeout=60.0, local=False, alpha=0.3):
+        self.name = name
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.local = local
+        self.alpha = alpha
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.latency = None
+        self.failures = 0
+        self.down_until = 0.0
+
+    def healthy(self, now=None):
+        return (now or time.monotonic()) >= self.down_until
+
+    def available(self):
+        return self.in_flight < self.max_concurrency
+
+    def record_latency(self, elapsed):
+        with self.lock:
+            self.latency = elapsed if self.latency is None else self.alpha * elapsed + (1 - self.alpha) * self.latency
+
+    def record_lower_bound(self, elapsed):
+        """Fold in a call abandoned after `elapsed` seconds; its true latency is at least that, so never lower the EWMA."""
+        with self.lock:
+            if self.latency is None or elapsed > self.latency:
+                self.latency = elapsed if self.latency is None else self.alpha * elapsed + (1 - self.alpha) * self.latency
+
+    def record_success(self, elapsed):
+        self.record_latency(elapsed)
+        with self.lock:
+            self.failures = 0
+            self.down_until = 0.0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            cooldown = min(FAILURE_COOLDOWN * 2 ** (self.failures - 1), MAX_FAILURE_COOLDOWN)
+            self.down_until = time.monotonic() + cooldown
+
+    def invoke(self, prompt, attempt=None):
+        attempt = attempt or Attempt()
+        with self.semaphore:
+            if not attempt.start():
+                raise CancelledError(f"LLM call on '{self.name}' was abandoned before it started")
+            with self.lock:
+                self.in_flight += 1
+            try:
+                result = self.llm.invoke(prompt)
+            except Exception:
+                if attempt.finish():
+                    self.record_failure()
+                raise
+            else:
+                if attempt.finish():
+                    self.record_success(time.monotonic() - attempt.started)
+                return result
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+class LLMRouter:
+    """Send each request to the fastest healthy backend, hedging with the next one when it runs long.
+
+    Backends are ranked by health, free capacity and latency EWMA; unmeasured backends rank as fastest so
+    they get tried, and local backends win ties. If the chosen backend hasn't answered after `hedge_after`
+    seconds the next backend is fired too and the first answer wins. Failures and timeouts fall back to the
+    next backend in line. A call waiting for a free slot on a busy backend isn't timed out; the hedge moves
+    the request on if the wait runs long.
+    """
+
+    def __init__(self, backends, hedge_after=15.0):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend.")
+        self.backends = list(backends)
+        self.hedge_after = hedge_after
+        self.executor = ThreadPoolExecutor(
+            max_workers=sum(backend.max_concurrency for backend in self.backends) * 2,
+            thread_name_prefix="llm"
+        )
+
+    def ranked(self):
+        """Backends in the order a new request should try them."""
+        now = time.monotonic()
+        return sorted(self.backends, key=lambda backend: (
+            not backend.healthy(now),
+            not backend.available(),
+            backend.latency or 0.0,
+            not backend.local
+        ))
+
+    def invoke(self, prompt):
+        queue = self.ranked()
+        pending = {}
+        last_error = None
+
+        def launch():
+            backend = queue.pop(0)
+            attempt = Attempt()
+            pending[self.executor.submit(backend.invoke, prompt, attempt)] = (backend, attempt)
+
+        launch()
+        first_start = time.monotonic()
+        hedged = False
+        try:
+            while pending:
+                now = time.monotonic()
+                deadlines = [
+                    attempt.started + backend.timeout if attempt.started is not None else now + QUEUED_POLL_INTERVAL
+                    for backend, attempt in pending.values()
+                ]
+                if queue and not hedged:
+                    deadlines.append(first_start + self.hedge_after)
+                done, _ = wait(pending, timeout=max(0.0, min(deadlines) - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        last_error = e
+
+                now = time.monotonic()
+                for future, (backend, attempt) in list(pending.items()):
+                    started = attempt.started
+                    if started is None or now - started < backend.timeout or not attempt.abandon():
+                        continue
+                    pending.pop(future)
+                    backend.record_lower_bound(now - started)
+                    backend.record_failure()
+                    last_error = TimeoutError(f"LLM backend '{backend.name}' timed out after {backend.timeout:g}s")
+
+                if queue and (not pending or (not hedged and now - first_start >= self.hedge_after)):
+                    hedged = hedged or bool(pending)
+                    launch()
+            raise last_error
+        finally:
+            # Abandon calls that lost the hedge, counting their time so far as a lower bound; ones still queued
+            # never reach their backend
+            now = time.monotonic()
+            for future, (backend, attempt) in pending.items():
+                future.cancel()
+                if attempt.abandon() and attempt.started is not None:
+                    backend.record_lower_bound(now - attempt.started)
+
+    def stats(self):
+        """Snapshot of each backend's routing state, for logging and debugging."""
+        return [{
+            'name': backend.name,
+            'latency': backend.latency,
+            'in_flight': backend.in_flight,
+            'healthy': backend.healthy(),
+            'failures': backend.failures
+        } for backend in self.backends]
@@ -0,0 +1,312 @@
+import threading
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+from sqlalchemy import inspect, text
+from src.data_fetch import engine, get_team_history, get_team_stats
+from src.prediction import MatchupPrediction, TeamRatings, derive_ratings, simulate_slate
+
+# Stats covered by the matrix, matching the TeamStats fields
+MATRIX_STATS = ['wins', 'losses', 'ppg', 'fg_pct', 'fg3_pct', 'ft_pct', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
+LOWER_IS_BETTER = {'losses', 'turnovers'}
+LOWER_MASK = np.array([stat in LOWER_IS_BETTER for stat in MATRIX_STATS])
+# Per-team model inputs the projections are simulated from
+RATING_FIELDS = list(TeamRatings.model_fields)
+
+# SQLite tables the matrix is persisted to
+PAIRS_TABLE = 'matchup_matrix'
+STATS_TABLE = 'matchup_matrix_stats'
+
+class MatchupMatrix:
+    """All-pairs head-to-head edges, radar values and model projections for a set of teams.
+
+    edges[i, j, k] is +1 when team i beats team j on MATRIX_STATS[k], -1 when it trails and 0 on a tie.
+    radar[i, j, k] is team i's value normalized against team j (inverted for LOWER_IS_BETTER stats).
+    ratings[i] holds team i's TeamRatings (RATING_FIELDS), predictions[i, j] the MatchupPrediction simulated
+    from those ratings for team i against team j, and win_prob[i, j] its team i win probability.
+    Missing stats and projections are NaN or None.
+    """
+
+    def __init__(self, team_names, values, ratings):
+        self.teams = list(team_names)
+        self.index = {name: i for i, name in enumerate(self.teams)}
+        self.values = np.asarray(values, dtype=float).reshape(len(self.teams), len(MATRIX_STATS))
+        self.ratings = np.array([_ratings_row(r) for r in ratings], dtype=float).reshape(len(self.teams), len(RATING_FIELDS))
+        self.lock = threading.Lock()
+        self.update_lock = threading.Lock()
+        self.edges, self.radar = self._block(slice(None), slice(None))
+        n = len(self.teams)
+        self.win_prob = np.full((n, n), np.nan)
+        self.predictions = np.full((n, n), None, dtype=object)
+        pairs = [(i, j) for i in range(n) for j in range(n) if i != j]
+        self._fill(pairs, simulate_slate([(self._team_ratings(i), self._team_ratings(j)) for i, j in pairs]))
+
+    @classmethod
+    def build(cls, team_stats, team_ratings=None):
+        """Build the full matrix from a {team name: stats dict} mapping.
+
+        `team_ratings` maps team names to TeamRatings derived with game logs; teams without one are rated from stats.
+        """
+        team_ratings = team_ratings or {}
+        return cls(team_stats.keys(), [_stats_row(stats) for stats in team_stats.values()],
+                   [team_ratings.get(name) or derive_ratings(stats) for name, stats in team_stats.items()])
+
+    def _block(self, rows, cols):
+        """Compute edges and radar values for teams[rows] against teams[cols]."""
+        a = self.values[rows][:, None, :]
+        b = self.values[cols][None, :, :]
+        with np.errstate(invalid='ignore'):
+            edges = np.sign(a - b) * np.where(LOWER_MASK, -1, 1)
+        return edges, radar_values(a, b)
+
+    def _team_ratings(self, i):
+        return TeamRatings(**{field: float(value) for field, value in zip(RATING_FIELDS, self.ratings[i])})
+
+    def _fill(self, pairs, predictions):
+        for (i, j), prediction in zip(pairs, predictions):
+            self.predictions[i, j] = prediction
+            self.win_prob[i, j] = prediction.team1_win_prob
+
+    def update_team(self, team_name, stats, ratings=None):
+        """Refresh one team, recomputing only its row and column. Returns True if anything changed.
+
+        Pass the team's TeamRatings to re-simulate its projections as well. Without them a known team keeps
+        the ratings its projections were simulated from, and a new team is rated from its stats.
+        """
+        row = _stats_row(stats)
+        with self.update_lock:
+            i = self.index.get(team_name)
+            new_team = i is None
+            if ratings is None and new_team:
+                ratings = derive_ratings(stats)
+            rating_row = None if ratings is None else _ratings_row(ratings)
+            stats_changed = new_team or not np.array_equal(self.values[i], row, equal_nan=True)
+            ratings_changed = rating_row is not None and (new_team or not np.array_equal(self.ratings[i], rating_row))
+            if not (stats_changed or ratings_changed):
+                return False
+
+            # Simulate before taking the read lock; update_lock keeps every other team's ratings fixed meanwhile
+            k = len(self.teams) if new_team else i
+            if ratings_changed:
+                others = [j for j in range(len(self.teams)) if j != k]
+                pairs = [(k, j) for j in others] + [(j, k) for j in others]
+                simulated = simulate_slate([
+                    (ratings if a == k else self._team_ratings(a), ratings if b == k else self._team_ratings(b))
+                    for a, b in pairs
+                ])
+
+            with self.lock:
+                if new_team:
+                    self.teams.append(team_name)
+                    self.values = np.vstack([self.values, row])
+                    self.ratings = np.vstack([self.ratings, rating_row])
+                    self.edges = _grow(self.edges, k + 1)
+                    self.radar = _grow(self.radar, k + 1)
+                    self.win_prob = _grow(self.win_prob, k + 1)
+                    self.predictions = _grow(self.predictions, k + 1, fill=None)
+                self.values[k] = row
+                edges, radar = self._block(slice(k, k + 1), slice(None))
+                self.edges[k], self.radar[k] = edges[0], radar[0]
+                edges, radar = self._block(slice(None), slice(k, k + 1))
+                self.edges[:, k], self.radar[:, k] = edges[:, 0], radar[:, 0]
+                if ratings_changed:
+                    self.ratings[k] = rating_row
+                    self._fill(pairs, simulated)
+                # Publish the new team only once its row and column exist
+                if new_team:
+                    self.index[team_name] = k
+        return True
+
+    def lookup(self, team1, team2):
+        """Return the precomputed comparison for two teams, or None if either is missing."""
+        with self.lock:
+            i, j = self.index.get(team1), self.index.get(team2)
+            if i is None or j is None:
+                return None
+            pair_edges = self.edges[i, j].copy()
+            pair_radar = self.radar[[i, j], [j, i]].copy()
+            win_prob = self.win_prob[i, j]
+            prediction = self.predictions[i, j]
+        edges = {}
+        radar = {}
+        for k, stat in enumerate(MATRIX_STATS):
+            edge = pair_edges[k]
+            edges[stat] = None if np.isnan(edge) else team1 if edge > 0 else team2 if edge < 0 else "Tie"
+            radar[stat] = (_value(pair_radar[0, k]), _value(pair_radar[1, k]))
+        return {'edges': edges, 'radar': radar, 'win_prob': _value(win_prob), 'prediction': prediction}
+
+    def prediction(self, team1, team2, ratings1, ratings2):
+        """Return the stored projection if both teams were simulated from exactly these ratings, else None."""
+        with self.lock:
+            i, j = self.index.get(team1), self.index.get(team2)
+            if i is None or j is None or i == j:
+                return None
+            if not (np.array_equal(self.ratings[i], _ratings_row(ratings1)) and np.array_equal(self.ratings[j], _ratings_row(ratings2))):
+                return None
+            return self.predictions[i, j]
+
+    def team_stats(self, team_name):
+        """Return the stats dict the matrix holds for a team."""
+        with self.lock:
+            row = self.values[self.index[team_name]].copy()
+        return _stats_dict(row)
+
+    def top_matchups(self, limit=10):
+        """Return the (team1, team2) pairs with the most combined wins, best first."""
+        with self.lock:
+            team_names = list(self.teams)
+            wins = np.nan_to_num(self.values[:, MATRIX_STATS.index('wins')])
+        upper = np.triu_indices(len(team_names), k=1)
+        order = np.argsort(-(wins[upper[0]] + wins[upper[1]]), kind='stable')[:limit]
+        return [(team_names[upper[0][k]], team_names[upper[1][k]]) for k in order]
+
+    def _pair_frame(self, rows, cols):
+        records = []
+        for i in rows:
+            for j in cols:
+                record = {'team1': self.teams[i], 'team2': self.teams[j]}
+                for k, stat in enumerate(MATRIX_STATS):
+                    record[f'edge_{stat}'] = self.edges[i, j, k]
+                    record[f'radar_{stat}'] = self.radar[i, j, k]
+                prediction = self.predictions[i, j]
+                record['win_prob'] = self.win_prob[i, j]
+                record['prediction'] = None if prediction is None else prediction.model_dump_json()
+                records.append(record)
+        return pd.DataFrame(records)
+
+    def _stats_frame(self, rows):
+        frame = pd.DataFrame(self.values[rows], columns=MATRIX_STATS)
+        frame.insert(0, 'team', [self.teams[i] for i in rows])
+        frame[RATING_FIELDS] = self.ratings[rows]
+        return frame
+
+    def save(self, db_engine=engine):
+        """Persist the whole matrix to SQLite. An empty matrix writes nothing."""
+        with self.lock:
+            if not self.teams:
+                return
+            everyone = range(len(self.teams))
+            stats = self._stats_frame(everyone)
+            pairs = self._pair_frame(everyone, everyone)
+        with db_engine.begin() as conn:
+            stats.to_sql(STATS_TABLE, conn, if_exists='replace', index=False)
+            pairs.to_sql(PAIRS_TABLE, conn, if_exists='replace', index=False)
+
+    def save_team(self, team_name, db_engine=engine):
+        """Persist only one team's row and column, leaving the rest of the stored matrix untouched."""
+        if not inspect(db_engine).has_table(PAIRS_TABLE):
+            return self.save(db_engine)
+        with self.lock:
+            i = self.index[team_name]
+            others = [j for j in range(len(self.teams)) if j != i]
+            stats = self._stats_frame([i])
+            pairs = pd.concat([self._pair_frame([i], range(len(self.teams))), self._pair_frame(others, [i])])
+        with db_engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {STATS_TABLE} WHERE team = :team"), {'team': team_name})
+            conn.execute(text(f"DELETE FROM {PAIRS_TABLE} WHERE team1 = :team OR team2 = :team"), {'team': team_name})
+            stats.to_sql(STATS_TABLE, conn, if_exists='append', index=False)
+            pairs.to_sql(PAIRS_TABLE, conn, if_exists='append', index=False)
+
+    @classmethod
+    def load(cls, db_engine=engine):
+        """Load a persisted matrix, or return None if none has been saved yet."""
+        tables = inspect(db_engine)
+        if not (tables.has_table(STATS_TABLE) and tables.has_table(PAIRS_TABLE)):
+            return None
+        stats = pd.read_sql(f"SELECT * FROM {STATS_TABLE}", db_engine)
+        pairs = pd.read_sql(f"SELECT * FROM {PAIRS_TABLE}", db_engine)
+
+        matrix = cls.__new__(cls)
+        matrix.teams = stats['team'].tolist()
+        matrix.index = {name: i for i, name in enumerate(matrix.teams)}
+        matrix.values = stats[MATRIX_STATS].to_numpy(dtype=float)
+        if all(field in stats.columns for field in RATING_FIELDS):
+            matrix.ratings = stats[RATING_FIELDS].to_numpy(dtype=float)
+        else:
+            # Saved before projections were stored; rate from stats, and simulate on first use
+            ratings = [_ratings_row(derive_ratings(_stats_dict(row))) for row in matrix.values]
+            matrix.ratings = np.array(ratings, dtype=float).reshape(len(matrix.teams), len(RATING_FIELDS))
+        matrix.lock = threading.Lock()
+        matrix.update_lock = threading.Lock()
+
+        rows = pairs['team1'].map(matrix.index).to_numpy()
+        cols = pairs['team2'].map(matrix.index).to_numpy()
+        n = len(matrix.teams)
+        matrix.edges = np.full((n, n, len(MATRIX_STATS)), np.nan)
+        matrix.edges[rows, cols] = pairs[[f'edge_{stat}' for stat in MATRIX_STATS]].to_numpy(dtype=float)
+        matrix.radar = np.full((n, n, len(MATRIX_STATS)), np.nan)
+        matrix.radar[rows, cols] = pairs[[f'radar_{stat}' for stat in MATRIX_STATS]].to_numpy(dtype=float)
+        matrix.win_prob = np.full((n, n), np.nan)
+        matrix.predictions = np.full((n, n), None, dtype=object)
+        if 'prediction' in pairs.columns:
+            saved = pairs['prediction'].notna().to_numpy()
+            matrix._fill(zip(rows[saved], cols[saved]),
+                         [MatchupPrediction.model_validate_json(p) for p in pairs['prediction'][saved]])
+        return matrix
+
+def radar_values(a, b):
+    """Normalize stat rows `a` against `b` (last axis follows MATRIX_STATS) for radar charts.
+
+    Each value is divided by the larger of the two, and inverted for LOWER_IS_BETTER stats; missing stats are NaN.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        peak = np.maximum(a, b)
+        ratio = a / peak
+        radar = np.where(peak > 0, np.where(LOWER_MASK, 1 - ratio, ratio), 0.0)
+    radar[np.isnan(a) | np.isnan(b)] = np.nan
+    return radar
+
+def pair_radar(stats1, stats2):
+    """Radar values for a single matchup, as {stat: (team1 value, team2 value)}."""
+    row1, row2 = _stats_row(stats1), _stats_row(stats2)
+    radar1, radar2 = radar_values(row1, row2), radar_values(row2, row1)
+    return {stat: (_value(radar1[k]), _value(radar2[k])) for k, stat in enumerate(MATRIX_STATS)}
+
+def _stats_row(stats):
+    return np.array([np.nan if stats.get(stat) is None else stats[stat] for stat in MATRIX_STATS], dtype=float)
+
+def _stats_dict(row):
+    return {stat: _value(value) for stat, value in zip(MATRIX_STATS, row)}
+
+def _ratings_row(ratings):
+    return np.array([getattr(ratings, field) for field in RATING_FIELDS], dtype=float)
+
+def _grow(array, n, fill=np.nan):
+    """Pad the first two (team) axes of an array with `fill` up to n teams."""
+    grown = np.full((n, n) + array.shape[2:], fill, dtype=array.dtype)
+    grown[:array.shape[0], :array.shape[1]] = array
+    return grown
+
+def _value(value):
+    return None if np.isnan(value) else float(value)
+
+def build_matchup_matrix(db_engine=engine):
+    """Job: build and persist the matrix for every team with stats available, rating teams from their game logs."""
+    team_stats = {}
+    team_ratings = {}
+    for team in teams.get_teams():
+        stats = get_team_stats(team['full_name'])
+        if stats:
+            team_stats[team['full_name']] = stats
+            team_ratings[team['full_name']] = derive_ratings(stats, get_team_history(team['full_name']))
+    matrix = MatchupMatrix.build(team_stats, team_ratings)
+    matrix.save(db_engine)
+    return matrix
+
+def refresh_matchup_matrix(team_name, stats=None, matrix=None, db_engine=engine, history=None):
+    """Job: refresh one team's row and column, projections included, after its stats change."""
+    matrix = matrix or MatchupMatrix.load(db_engine) or MatchupMatrix.build({})
+    stats = stats or get_team_stats(team_name)
+    if not stats:
+        return matrix
+    history = history if history is not None else get_team_history(team_name)
+    if matrix.update_team(team_name, stats, derive_ratings(stats, history)):
+        matrix.save_team(team_name, db_engine)
+    return matrix
+
+if __name__ == "__main__":
+    built = build_matchup_matrix()
+    if built.teams:
+        print(f"Built matchup matrix for {len(built.teams)} teams.")
+    else:
+        print("No team stats available; nothing was saved.")
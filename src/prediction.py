@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pydantic import BaseModel
+
+# League-wide baselines used when a team has no game logs to learn from
+LEAGUE_AVG_RATING = 114.0   # Points per 100 possessions
+LEAGUE_AVG_PACE = 99.0      # Possessions per 48 minutes
+PACE_STD = 4.0              # Game-to-game spread in possessions
+SCORE_STD = 9.5             # Game-to-game spread in a team's points at fixed pace
+PYTHAGOREAN_EXPONENT = 14.0 # Morey's exponent for NBA win expectation
+DEFAULT_SIMULATIONS = 100_000
+
+# Margin histogram buckets (team1 points minus team2 points)
+MARGIN_BINS = np.arange(-40, 42, 2)
+
+class TeamRatings(BaseModel):
+    off_rating: float
+    def_rating: float
+    pace: float
+    score_std: float = SCORE_STD
+
+class MatchupPrediction(BaseModel):
+    team1_win_prob: float
+    team2_win_prob: float
+    spread: float
+    team1_score: float
+    team2_score: float
+    team1_score_range: tuple[float, float]
+    team2_score_range: tuple[float, float]
+    margin_range: tuple[float, float]
+    margin_bins: list[float]
+    margin_probs: list[float]
+    simulations: int
+
+def estimate_possessions(fga, oreb, tov, fta):
+    """Estimate possessions from box score totals (works on scalars and arrays)."""
+    return fga - oreb + tov + 0.44 * fta
+
+def points_allowed(ppg, wins, losses):
+    """Back out points allowed per game from scoring and record via the Pythagorean expectation."""
+    games = (wins or 0) + (losses or 0)
+    win_pct = (wins or 0) / games if games else 0.5
+    win_pct = min(max(win_pct, 0.02), 0.98)
+    return ppg * ((1 - win_pct) / win_pct) ** (1 / PYTHAGOREAN_EXPONENT)
+
+def derive_ratings(stats, history=None):
+    """Derive offensive/defensive ratings and pace from team stats and optional game logs."""
+    ppg = stats.get('ppg') or LEAGUE_AVG_RATING * LEAGUE_AVG_PACE / 100
+    allowed = points_allowed(ppg, stats.get('wins'), stats.get('losses'))
+    pace = LEAGUE_AVG_PACE
+    score_std = SCORE_STD
+
+    required = ['FGA', 'OREB', 'TOV', 'FTA', 'PTS']
+    if history is not None and not history.empty and all(col in history.columns for col in required):
+        logs = history[required].astype(float).to_numpy()
+        possessions = estimate_possessions(logs[:, 0], logs[:, 1], logs[:, 2], logs[:, 3])
+        pace = float(possessions.mean())
+        if len(logs) > 1:
+            # Measure scoring spread at a fixed pace; pace variation is simulated separately
+            score_std = float((logs[:, 4] / possessions * pace).std(ddof=1))
+
+    return TeamRatings(
+        off_rating=ppg / pace * 100,
+        def_rating=allowed / pace * 100,
+        pace=pace,
+        score_std=score_std
+    )
+
+def ratings_seed(ratings1, ratings2, home_advantage=0.0):
+    """Seed derived from the matchup inputs, so identical inputs always give identical simulations."""
+    payload = json.dumps([ratings1.model_dump(), ratings2.model_dump(), home_advantage])
+    return int.from_bytes(hashlib.sha256(payload.encode()).digest()[:8], 'little')
+
+def simulate_matchup(ratings1, ratings2, n_sims=DEFAULT_SIMULATIONS, home_advantage=0.0, seed=None):
+    """Run vectorized Monte Carlo games between two teams; home_advantage is in team1's favour.
+
+    Without an explicit seed the run is seeded from the ratings, so the same inputs give the same prediction.
+    """
+    if seed is None:
+        seed = ratings_seed(ratings1, ratings2, home_advantage)
+    rng = np.random.default_rng(seed)
+
+    # Shared pace per game, so both scores move together in fast or slow games
+    possessions = rng.normal((ratings1.pace + ratings2.pace) / 2, PACE_STD, n_sims)
+    expected1 = ratings1.off_rating * ratings2.def_rating / LEAGUE_AVG_RATING
+    expected2 = ratings2.off_rating * ratings1.def_rating / LEAGUE_AVG_RATING
+    scores1 = possessions * expected1 / 100 + home_advantage / 2 + rng.normal(0, ratings1.score_std, n_sims)
+    scores2 = possessions * expected2 / 100 - home_advantage / 2 + rng.normal(0, ratings2.score_std, n_sims)
+    scores1 = np.rint(scores1)
+    scores2 = np.rint(scores2)
+
+    # Games tied after regulation go to overtime, settled by a coin flip
+    margins = scores1 - scores2
+    team1_wins = (margins > 0) | ((margins == 0) & (rng.random(n_sims) < 0.5))
+    win_prob = float(team1_wins.mean())
+
+    counts, _ = np.histogram(np.clip(margins, MARGIN_BINS[0], MARGIN_BINS[-1] - 1), bins=MARGIN_BINS)
+    score1_range = np.percentile(scores1, [10, 90])
+    score2_range = np.percentile(scores2, [10, 90])
+    margin_range = np.percentile(margins, [10, 90])
+
+    return MatchupPrediction(
+        team1_win_prob=round(win_prob, 4),
+        team2_win_prob=round(1 - win_prob, 4),
+        spread=round(float(margins.mean()), 1),
+        team1_score=round(float(scores1.mean()), 1),
+        team2_score=round(float(scores2.mean()), 1),
+        team1_score_range=(float(score1_range[0]), float(score1_range[1])),
+        team2_score_range=(float(score2_range[0]), float(score2_range[1])),
+        margin_range=(float(margin_range[0]), float(margin_range[1])),
+        margin_bins=MARGIN_BINS[:-1].tolist(),
+        margin_probs=(counts / n_sims).round(4).tolist(),
+        simulations=n_sims
+    )
+
+def predict_matchup(stats1, stats2, history1=None, history2=None, n_sims=DEFAULT_SIMULATIONS, seed=None):
+    """Predict a matchup straight from team stats and game logs."""
+    return simulate_matchup(derive_ratings(stats1, history1), derive_ratings(stats2, history2), n_sims=n_sims, seed=seed)
+
+def _simulate_pair(args):
+    ratings1, ratings2, n_sims, seed = args
+    return simulate_matchup(ratings1, ratings2, n_sims=n_sims, seed=seed)
+
+def simulate_slate(matchups, n_sims=DEFAULT_SIMULATIONS, max_workers=None, seed=None):
+    """Simulate a whole slate of (ratings1, ratings2) matchups, fanning out over a process pool.
+
+    Without a seed each matchup is seeded from its ratings, matching what simulate_matchup gives on its own.
+    """
+    if seed is None:
+        seeds = [None] * len(matchups)
+    else:
+        seeds = np.random.SeedSequence(seed).generate_state(len(matchups)).tolist() if matchups else []
+    tasks = [(r1, r2, n_sims, s) for (r1, r2), s in zip(matchups, seeds)]
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        return [_simulate_pair(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_simulate_pair, tasks))
+
+def describe_prediction(team1, team2, prediction):
+    """Summarise a prediction as plain text for prompts and captions."""
+    favourite, underdog = (team1, team2) if prediction.spread >= 0 else (team2, team1)
+    return (
+        f"Model projection from {prediction.simulations:,} simulated games: "
+        f"{team1} win probability {prediction.team1_win_prob:.1%}, {team2} win probability {prediction.team2_win_prob:.1%}. "
+        f"Projected score {team1} {prediction.team1_score:.1f} - {team2} {prediction.team2_score:.1f}, "
+        f"{favourite} favoured by {abs(prediction.spread):.1f} over {underdog}. "
+        f"80% of simulated margins ({team1} minus {team2}) fall between "
+        f"{prediction.margin_range[0]:+.0f} and {prediction.margin_range[1]:+.0f}."
+    )
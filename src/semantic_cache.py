@@ -0,0 +1,115 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+from src.data_fetch import engine
+
+# How far (in scaled stat units) a new request may drift from a cached one and still reuse its analysis
+SEMANTIC_CACHE_DISTANCE = float(os.getenv("SEMANTIC_CACHE_DISTANCE", "0.15"))
+# How long a cached analysis stays fresh, in seconds
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 60 * 60)))
+VECTOR_SIZE = 256
+CACHE_TABLE = 'analysis_cache'
+
+# Size of a meaningful change per stat, so every dimension of the vector is on a comparable scale
+STAT_SCALES = {
+    'wins': 82.0,
+    'losses': 82.0,
+    'ppg': 10.0,
+    'fg_pct': 0.05,
+    'fg3_pct': 0.05,
+    'ft_pct': 0.05,
+    'rebounds': 5.0,
+    'assists': 5.0,
+    'steals': 2.0,
+    'blocks': 2.0,
+    'turnovers': 2.0,
+    # Model projection the analysis was written against
+    'win_prob': 0.1,
+    'spread': 3.0
+}
+
+def stats_vector(stats1, stats2, projection=None, dims=VECTOR_SIZE):
+    """Feature-hash both teams' stat payloads, plus the model projection if given, into one fixed-size vector."""
+    vector = np.zeros(dims)
+    for prefix, stats in (('team1', stats1), ('team2', stats2), ('model', projection or {})):
+        for stat, value in stats.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            digest = hashlib.md5(f"{prefix}:{stat}".encode()).digest()
+            index = int.from_bytes(digest[:4], 'little') % dims
+            sign = 1 if digest[4] & 1 else -1
+            vector[index] += sign * float(value) / STAT_SCALES.get(stat, 1.0)
+    return vector
+
+def matchup_key(team1, team2, players1, players2):
+    """Partition key for the index: the ordered matchup plus a digest of both rosters."""
+    rosters = hashlib.sha1(json.dumps([players1, players2], default=str).encode()).hexdigest()[:12]
+    return f"{team1}|{team2}|{rosters}"
+
+class SemanticCache:
+    """Vector index of past LLM analyses, searched by nearest stat vector within the same matchup."""
+
+    def __init__(self, max_distance=SEMANTIC_CACHE_DISTANCE, ttl=SEMANTIC_CACHE_TTL, db_engine=engine):
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.db_engine = db_engine
+        self.entries = {}  # matchup key -> list of (created_at, vector, analysis, projection text)
+        self.lock = threading.Lock()
+        self.loaded = db_engine is None
+
+    def _load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        if not inspect(self.db_engine).has_table(CACHE_TABLE):
+            return
+        rows = pd.read_sql(f"SELECT * FROM {CACHE_TABLE} WHERE created_at >= :cutoff", self.db_engine,
+                           params={'cutoff': time.time() - self.ttl})
+        for row in rows.itertuples(index=False):
+            entry = (row.created_at, np.array(json.loads(row.vector)), row.analysis, getattr(row, 'projection_text', None))
+            self.entries.setdefault(row.matchup, []).append(entry)
+
+    def lookup(self, team1, team2, stats1, stats2, players1="", players2="", projection=None, now=None):
+        """Return (analysis, projection text it was written against) for the closest fresh match, or None.
+
+        `projection` is a {'win_prob': ..., 'spread': ...} mapping, so a moved projection misses like moved stats.
+        """
+        now = now or time.time()
+        key = matchup_key(team1, team2, players1, players2)
+        with self.lock:
+            self._load()
+            fresh = [entry for entry in self.entries.get(key, []) if now - entry[0] <= self.ttl]
+            self.entries[key] = fresh
+        if not fresh:
+            return None
+        distances = np.linalg.norm(np.stack([entry[1] for entry in fresh]) - stats_vector(stats1, stats2, projection), axis=1)
+        best = int(np.argmin(distances))
+        return fresh[best][2:] if distances[best] <= self.max_distance else None
+
+    def add(self, team1, team2, stats1, stats2, players1, players2, analysis, projection=None, projection_text=None, now=None):
+        """Index a freshly generated analysis, along with the projection it was written against."""
+        now = now or time.time()
+        key = matchup_key(team1, team2, players1, players2)
+        vector = stats_vector(stats1, stats2, projection)
+        with self.lock:
+            self._load()
+            self.entries.setdefault(key, []).append((now, vector, analysis, projection_text))
+            if self.db_engine is not None:
+                with self.db_engine.begin() as conn:
+                    if inspect(conn).has_table(CACHE_TABLE):
+                        conn.execute(text(f"DELETE FROM {CACHE_TABLE} WHERE created_at < :cutoff"), {'cutoff': now - self.ttl})
+                    pd.DataFrame([{
+                        'matchup': key,
+                        'created_at': now,
+                        'vector': json.dumps(vector.tolist()),
+                        'analysis': analysis,
+                        'projection_text': projection_text
+                    }]).to_sql(CACHE_TABLE, conn, if_exists='append', index=False)
+
+analysis_cache = SemanticCache()
@@ -0,0 +1,51 @@
+import json
+from src.charts import ChartSpecCache, chart_cache, data_version, get_chart_specs, render_bar_specs, warm_chart_cache
+from src.matchup_matrix import MatchupMatrix
+
+STATS1 = {'wins': 60, 'losses': 22, 'ppg': 118.5, 'fg_pct': 0.485, 'fg3_pct': 0.37, 'rebounds': 45.2, 'assists': 24.8}
+STATS2 = {'wins': 48, 'losses': 34, 'ppg': 108.2, 'fg_pct': 0.47, 'fg3_pct': 0.39, 'rebounds': 43.5, 'assists': 26.2}
+SELECTED = ['wins', 'losses', 'ppg', 'rebounds', 'assists', 'fg_pct', 'fg3_pct']
+
+def test_chart_specs_are_serialized():
+    """Radar and bar specs should be valid Plotly / Vega-Lite JSON"""
+    specs = get_chart_specs("Boston Celtics", "Miami Heat", STATS1, STATS2, SELECTED)
+    radar = json.loads(specs['radar'])
+    assert [trace['name'] for trace in radar['data']] == ["Boston Celtics", "Miami Heat"]
+    assert set(specs['bars']) == {'Record', 'Shooting', 'Performance'}
+    shooting = json.loads(specs['bars']['Shooting'])
+    values = [row['Value'] for row in next(iter(shooting['datasets'].values()))]
+    assert max(values) <= 100 and min(values) > 1
+
+def test_chart_specs_are_cached_by_data_version():
+    """Repeat requests hit the cache; changed stats produce a new version and new specs"""
+    first = get_chart_specs("Team A", "Team B", STATS1, STATS2, SELECTED)
+    assert get_chart_specs("Team A", "Team B", dict(STATS1), dict(STATS2), SELECTED) is first
+    moved = dict(STATS1, ppg=119.0)
+    assert data_version(moved, STATS2) != data_version(STATS1, STATS2)
+    assert get_chart_specs("Team A", "Team B", moved, STATS2, SELECTED) is not first
+
+def test_radar_needs_three_stats():
+    """The radar spec is skipped when too few non-record stats are selected"""
+    specs = get_chart_specs("Team A", "Team B", STATS1, STATS2, ['wins', 'losses', 'ppg'])
+    assert specs['radar'] is None
+    assert list(render_bar_specs("Team A", "Team B", STATS1, STATS2, ['wins', 'losses', 'ppg'])) == ['Record', 'Performance']
+
+def test_lru_eviction():
+    """The least recently used spec is evicted once the cache is full"""
+    cache = ChartSpecCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+def test_warm_chart_cache():
+    """Warmup pre-renders specs that later requests with the same stats reuse"""
+    matrix = MatchupMatrix.build({'Team X': STATS1, 'Team Y': STATS2, 'Team Z': dict(STATS2, wins=20, losses=62)})
+    assert warm_chart_cache(matrix, limit=1) == 1
+    assert matrix.top_matchups(1) == [('Team X', 'Team Y')]
+    before = len(chart_cache)
+    get_chart_specs('Team X', 'Team Y', STATS1, STATS2, ['wins', 'losses', 'ppg', 'rebounds', 'assists', 'fg_pct', 'fg3_pct'])
+    get_chart_specs('Team Y', 'Team X', STATS2, STATS1, ['wins', 'losses', 'ppg', 'rebounds', 'assists', 'fg_pct', 'fg3_pct'])
+    assert len(chart_cache) == before
@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.llm_router import Backend, LLMRouter
+
+class FakeLLM:
+    """Local stand-in for an LLM backend with a fixed delay"""
+    def __init__(self, reply, delay=0.0, fail=False):
+        self.reply = reply
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.reply} is down")
+        return f"{self.reply}: {prompt}"
+
+def test_routes_to_fastest_backend():
+    """Once latencies are measured, requests go to the fastest backend"""
+    slow = Backend("slow", FakeLLM("slow", delay=0.05), local=True)
+    fast = Backend("fast", FakeLLM("fast", delay=0.0))
+    router = LLMRouter([slow, fast], hedge_after=10)
+    assert router.invoke("hi") == "slow: hi"  # Unmeasured local backend wins the tie
+    router.invoke("hi")
+    assert router.invoke("hi") == "fast: hi"
+    assert fast.latency < slow.latency
+
+def test_falls_back_on_failure():
+    """A failing backend is skipped and put into cooldown"""
+    broken = Backend("broken", FakeLLM("broken", fail=True), local=True)
+    backup = Backend("backup", FakeLLM("backup"))
+    router = LLMRouter([broken, backup], hedge_after=10)
+    assert router.invoke("hi") == "backup: hi"
+    assert not broken.healthy()
+    assert router.ranked()[0] is backup
+
+def test_hedges_long_tail_requests():
+    """A second backend is fired once the first runs past the hedge threshold"""
+    stuck = Backend("stuck", FakeLLM("stuck", delay=0.5), local=True)
+    hedge = Backend("hedge", FakeLLM("hedge", delay=0.0))
+    router = LLMRouter([stuck, hedge], hedge_after=0.05)
+    start = time.monotonic()
+    assert router.invoke("hi") == "hedge: hi"
+    assert time.monotonic() - start < 0.4
+
+def test_timeout_and_all_failed():
+    """Timeouts count as failures, and the last error is raised when every backend fails"""
+    router = LLMRouter([Backend("sleepy", FakeLLM("sleepy", delay=0.3), timeout=0.05)], hedge_after=10)
+    with pytest.raises(TimeoutError):
+        router.invoke("hi")
+    router = LLMRouter([Backend("a", FakeLLM("a", fail=True)), Backend("b", FakeLLM("b", fail=True))])
+    with pytest.raises(RuntimeError):
+        router.invoke("hi")
+
+def test_concurrency_limit():
+    """Each backend never runs more requests than its semaphore allows"""
+    fake = FakeLLM("only", delay=0.05)
+    backend = Backend("only", fake, max_concurrency=2)
+    router = LLMRouter([backend], hedge_after=10)
+    peak = []
+    original = fake.invoke
+
+    def tracking_invoke(prompt):
+        peak.append(backend.in_flight)
+        return original(prompt)
+
+    fake.invoke = tracking_invoke
+    with ThreadPoolExecutor(max_workers=6) as callers:
+        results = list(callers.map(router.invoke, range(6)))
+    assert results == [f"only: {i}" for i in range(6)]
+    assert max(peak) <= 2
+
+def test_queue_wait_does_not_count_toward_timeout():
+    """Requests waiting for a free slot aren't timed out, and the backend stays healthy"""
+    backend = Backend("single", FakeLLM("single", delay=0.3), max_concurrency=1, timeout=0.5)
+    router = LLMRouter([backend], hedge_after=10)
+    with ThreadPoolExecutor(max_workers=4) as callers:
+        results = list(callers.map(router.invoke, range(4)))
+    assert results == [f"single: {i}" for i in range(4)]
+    assert backend.healthy()
+    assert backend.failures == 0
+
+def test_late_answer_keeps_timeout_penalty():
+    """A call that answers after timing out doesn't reset the backend's health or latency"""
+    backend = Backend("late", FakeLLM("late", delay=0.2), timeout=0.05)
+    router = LLMRouter([backend], hedge_after=10)
+    with pytest.raises(TimeoutError):
+        router.invoke("hi")
+    time.sleep(0.3)
+    assert not backend.healthy()
+    assert backend.failures == 1
+    assert backend.latency < 0.15
+
+def test_hedge_loser_latency_does_not_improve():
+    """A slow backend that loses a hedge keeps its latency estimate, even when its answer arrives later"""
+    slow = Backend("slow", FakeLLM("slow", delay=0.3))
+    fast = Backend("fast", FakeLLM("fast"))
+    slow.latency, fast.latency = 0.5, 1.0
+    router = LLMRouter([slow, fast], hedge_after=0.05)
+    assert router.invoke("hi") == "fast: hi"
+    time.sleep(0.4)
+    assert slow.latency == 0.5
+    assert slow.failures == 0
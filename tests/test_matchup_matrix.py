@@ -0,0 +1,77 @@
+import numpy as np
+from sqlalchemy import create_engine
+import src.matchup_matrix
+from src.matchup_matrix import MatchupMatrix, build_matchup_matrix, pair_radar
+from src.prediction import derive_ratings, predict_matchup
+
+TEAM_STATS = {
+    'Team A': {'wins': 60, 'losses': 22, 'ppg': 118.5, 'rebounds': 45.2, 'turnovers': 12.8},
+    'Team B': {'wins': 45, 'losses': 37, 'ppg': 112.2, 'rebounds': 47.0, 'turnovers': 13.5},
+    'Team C': {'wins': 25, 'losses': 57, 'ppg': 108.2, 'rebounds': 43.1, 'turnovers': 15.1},
+}
+
+def test_lookup_matches_head_to_head_rules():
+    """Edges respect lower-is-better stats and radar values are normalized per pair"""
+    matrix = MatchupMatrix.build(TEAM_STATS)
+    matchup = matrix.lookup('Team A', 'Team B')
+    assert matchup['edges']['ppg'] == 'Team A'
+    assert matchup['edges']['rebounds'] == 'Team B'
+    assert matchup['edges']['losses'] == 'Team A'
+    assert matchup['edges']['turnovers'] == 'Team A'
+    assert matchup['edges']['assists'] is None
+    assert matchup['radar']['ppg'] == (1.0, 112.2 / 118.5)
+    assert matrix.lookup('Team A', 'Unknown Team') is None
+
+def test_incremental_update_matches_full_rebuild():
+    """Updating one team should give the same matrix as rebuilding everything"""
+    matrix = MatchupMatrix.build(TEAM_STATS)
+    changed = dict(TEAM_STATS, **{'Team C': dict(TEAM_STATS['Team C'], ppg=121.0)})
+    assert matrix.update_team('Team C', changed['Team C'])
+    assert not matrix.update_team('Team C', changed['Team C'])
+    rebuilt = MatchupMatrix.build(changed, {'Team C': derive_ratings(TEAM_STATS['Team C'])})
+    assert np.allclose(matrix.radar, rebuilt.radar, equal_nan=True)
+    assert np.array_equal(matrix.edges, rebuilt.edges, equal_nan=True)
+    assert np.array_equal(matrix.win_prob, rebuilt.win_prob, equal_nan=True)
+
+    # New ratings re-simulate the team's projections, matching a rebuild from the same ratings
+    ratings = derive_ratings(changed['Team C'])
+    assert matrix.update_team('Team C', changed['Team C'], ratings)
+    rebuilt = MatchupMatrix.build(changed)
+    assert np.array_equal(matrix.win_prob, rebuilt.win_prob, equal_nan=True)
+    assert matrix.lookup('Team B', 'Team C') == rebuilt.lookup('Team B', 'Team C')
+
+def test_projections_match_a_fresh_simulation():
+    """Stored projections are what the page would simulate from the same ratings, and only served for them"""
+    matrix = MatchupMatrix.build(TEAM_STATS)
+    prediction = predict_matchup(TEAM_STATS['Team A'], TEAM_STATS['Team C'])
+    assert matrix.lookup('Team A', 'Team C')['prediction'] == prediction
+    assert matrix.lookup('Team A', 'Team C')['win_prob'] == prediction.team1_win_prob
+    ratings_a, ratings_c = derive_ratings(TEAM_STATS['Team A']), derive_ratings(TEAM_STATS['Team C'])
+    assert matrix.prediction('Team A', 'Team C', ratings_a, ratings_c) == prediction
+    moved = ratings_c.model_copy(update={'pace': ratings_c.pace + 1})
+    assert matrix.prediction('Team A', 'Team C', ratings_a, moved) is None
+
+def test_save_and_load_round_trip():
+    """A persisted matrix, including incremental saves, should load back identically"""
+    db_engine = create_engine('sqlite://')
+    matrix = MatchupMatrix.build({})
+    for team, stats in TEAM_STATS.items():
+        matrix.update_team(team, stats)
+        matrix.save_team(team, db_engine)
+    loaded = MatchupMatrix.load(db_engine)
+    for team1 in TEAM_STATS:
+        for team2 in TEAM_STATS:
+            assert loaded.lookup(team1, team2) == matrix.lookup(team1, team2)
+
+def test_pair_radar_matches_matrix():
+    """The single-matchup radar helper agrees with the matrix lookup"""
+    matrix = MatchupMatrix.build(TEAM_STATS)
+    assert pair_radar(TEAM_STATS['Team A'], TEAM_STATS['Team C']) == matrix.lookup('Team A', 'Team C')['radar']
+
+def test_empty_matrix_saves_nothing(monkeypatch):
+    """With no stats available the job builds an empty matrix and leaves the database alone"""
+    db_engine = create_engine('sqlite://')
+    monkeypatch.setattr(src.matchup_matrix, 'get_team_stats', lambda team_name: None)
+    matrix = build_matchup_matrix(db_engine)
+    assert matrix.teams == []
+    assert MatchupMatrix.load(db_engine) is None
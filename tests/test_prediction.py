@@ -0,0 +1,60 @@
+import time
+import pandas as pd
+from src.prediction import derive_ratings, simulate_matchup, predict_matchup, simulate_slate, describe_prediction
+
+STRONG = {'wins': 60, 'losses': 22, 'ppg': 118.5}
+WEAK = {'wins': 25, 'losses': 57, 'ppg': 108.2}
+
+def test_derive_ratings_from_record():
+    """Winning teams should rate better on both ends of the floor"""
+    strong = derive_ratings(STRONG)
+    weak = derive_ratings(WEAK)
+    assert strong.off_rating > weak.off_rating
+    assert strong.def_rating < weak.def_rating
+
+def test_derive_ratings_missing_record():
+    """Missing wins or losses fall back to a neutral record instead of failing"""
+    ratings = derive_ratings({'wins': None, 'losses': 10, 'ppg': 110.0})
+    assert ratings.def_rating > ratings.off_rating
+    neutral = derive_ratings({'wins': None, 'losses': None, 'ppg': 110.0})
+    assert abs(neutral.off_rating - neutral.def_rating) < 1e-9
+
+def test_derive_ratings_uses_game_logs():
+    """Pace and scoring spread should come from the game logs when provided"""
+    history = pd.DataFrame({
+        'FGA': [88, 92, 90], 'OREB': [10, 12, 11], 'TOV': [14, 13, 12],
+        'FTA': [20, 25, 22], 'PTS': [110, 120, 115]
+    })
+    ratings = derive_ratings(STRONG, history)
+    assert abs(ratings.pace - 101.83) < 0.01
+    assert 0 < ratings.score_std < 10
+
+def test_simulate_matchup_probabilities():
+    """Simulation output should be consistent and favour the stronger team"""
+    prediction = predict_matchup(STRONG, WEAK, seed=7)
+    assert abs(prediction.team1_win_prob + prediction.team2_win_prob - 1) < 1e-9
+    assert prediction.team1_win_prob > 0.5
+    assert prediction.spread > 0
+    assert abs(sum(prediction.margin_probs) - 1) < 0.01
+    assert prediction == predict_matchup(STRONG, WEAK, seed=7)
+
+def test_unseeded_predictions_are_deterministic():
+    """Identical inputs give identical predictions; changed inputs give a new seed"""
+    assert predict_matchup(STRONG, WEAK) == predict_matchup(dict(STRONG), dict(WEAK))
+    assert predict_matchup(STRONG, WEAK) != predict_matchup(dict(STRONG, ppg=118.6), WEAK)
+
+def test_simulate_matchup_is_fast():
+    """100k simulated games should comfortably fit within an interactive request"""
+    ratings1, ratings2 = derive_ratings(STRONG), derive_ratings(WEAK)
+    start = time.perf_counter()
+    simulate_matchup(ratings1, ratings2, n_sims=100_000, seed=1)
+    assert time.perf_counter() - start < 0.1
+
+def test_simulate_slate_and_description():
+    """Slate runs should return one prediction per matchup, and descriptions mention both teams"""
+    ratings1, ratings2 = derive_ratings(STRONG), derive_ratings(WEAK)
+    results = simulate_slate([(ratings1, ratings2), (ratings2, ratings1)], n_sims=10_000, max_workers=1, seed=3)
+    assert len(results) == 2
+    assert results[0].team1_win_prob > results[1].team1_win_prob
+    text = describe_prediction("Team A", "Team B", results[0])
+    assert "Team A" in text and "Team B" in text
@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine
+from src.semantic_cache import SemanticCache
+
+STATS1 = {'wins': 50, 'losses': 32, 'ppg': 110.5, 'fg_pct': 0.485, 'rebounds': 45.2}
+STATS2 = {'wins': 48, 'losses': 34, 'ppg': 108.2, 'fg_pct': 0.47, 'rebounds': 43.5}
+
+def test_near_duplicate_stats_reuse_analysis():
+    """One more game played should still hit the cached analysis for the same matchup"""
+    cache = SemanticCache(max_distance=0.15, ttl=3600, db_engine=None)
+    cache.add("Team A", "Team B", STATS1, STATS2, "p1", "p2", "cached analysis", now=1000)
+    next_game = dict(STATS1, wins=51, ppg=110.6)
+    assert cache.lookup("Team A", "Team B", next_game, STATS2, "p1", "p2", now=1100) == ("cached analysis", None)
+
+def test_misses():
+    """Big stat moves, other matchups, roster changes and stale entries all miss"""
+    cache = SemanticCache(max_distance=0.15, ttl=3600, db_engine=None)
+    cache.add("Team A", "Team B", STATS1, STATS2, "p1", "p2", "cached analysis", now=1000)
+    assert cache.lookup("Team A", "Team B", dict(STATS1, ppg=114.0), STATS2, "p1", "p2", now=1100) is None
+    assert cache.lookup("Team B", "Team A", STATS1, STATS2, "p1", "p2", now=1100) is None
+    assert cache.lookup("Team A", "Team B", STATS1, STATS2, "p1, new signing", "p2", now=1100) is None
+    assert cache.lookup("Team A", "Team B", STATS1, STATS2, "p1", "p2", now=5000) is None
+
+def test_nearest_entry_wins():
+    """The closest of several cached analyses is served"""
+    cache = SemanticCache(max_distance=0.15, ttl=3600, db_engine=None)
+    cache.add("Team A", "Team B", STATS1, STATS2, "p1", "p2", "older", now=1000)
+    cache.add("Team A", "Team B", dict(STATS1, wins=53), STATS2, "p1", "p2", "newer", now=1200)
+    assert cache.lookup("Team A", "Team B", dict(STATS1, wins=54), STATS2, "p1", "p2", now=1300) == ("newer", None)
+
+def test_persistence():
+    """Analyses written to the database are found by a fresh cache instance"""
+    db_engine = create_engine('sqlite://')
+    SemanticCache(ttl=3600, db_engine=db_engine).add("Team A", "Team B", STATS1, STATS2, "p1", "p2", "stored")
+    assert SemanticCache(ttl=3600, db_engine=db_engine).lookup("Team A", "Team B", STATS1, STATS2, "p1", "p2") == ("stored", None)
+
+def test_projection_is_part_of_the_key():
+    """A moved projection misses; a nearby one is served with the projection text it was written against"""
+    cache = SemanticCache(max_distance=0.15, ttl=3600, db_engine=None)
+    cache.add("Team A", "Team B", STATS1, STATS2, "p1", "p2", "cached analysis",
+              projection={'win_prob': 0.60, 'spread': 3.0}, projection_text="60% / +3.0", now=1000)
+    near = cache.lookup("Team A", "Team B", STATS1, STATS2, "p1", "p2", projection={'win_prob': 0.605, 'spread': 3.1}, now=1100)
+    assert near == ("cached analysis", "60% / +3.0")
+    assert cache.lookup("Team A", "Team B", STATS1, STATS2, "p1", "p2", projection={'win_prob': 0.70, 'spread': 6.0}, now=1100) is None